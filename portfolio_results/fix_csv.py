@@ -5,9 +5,15 @@ This script reads a malformed CSV where the signals column contains unquoted com
 and writes a properly formatted CSV with quoted fields.
 """
 import csv
+import os
 import sys
+import tempfile
 from pathlib import Path
 
+# 1 MiB I/O buffers so reads and writes reach the OS in large blocks
+# rather than one small write() per row
+BUFFER_SIZE = 1 << 20
+
 def fix_csv(input_file: str, output_file: str = None):
     """Fix CSV by reading with flexible parsing and writing with proper quoting."""
 
@@ -29,42 +35,44 @@ def fix_csv(input_file: str, output_file: str = None):
         'signal_date', 'start_date', 'priority_strategy', 'signals'
     ]
 
-    fixed_rows = []
+    processed = 0
 
-    # Read the malformed CSV
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    # Stream into a temp file next to the output and swap it in at the end, so an
+    # in-place repair (output_file == input_file) never truncates the input mid-read
+    output_dir = Path(output_file).resolve().parent
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=output_dir)
+    try:
+        with open(input_file, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as f_in, \
+                open(fd, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE) as f_out:
+            writer = csv.writer(f_out, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(expected_cols)
 
-    # Process header
-    header_line = lines[0].strip()
-    header_parts = header_line.split(',')
+            # Skip the malformed header; expected_cols replaces it
+            next(f_in, None)
 
-    # Process data rows
-    for line in lines[1:]:
-        parts = line.strip().split(',')
+            for line in f_in:
+                # Split at most 24 times: any extra commas belong to the signals column,
+                # which comes back as the last field without a split/join round trip
+                row_data = line.strip().split(',', 24)
 
-        # If we have more than 25 parts, the extras are from the signals column
-        if len(parts) > 25:
-            # Take the first 24 columns as-is
-            row_data = parts[:24]
-            # Join the remaining parts as the signals column
-            signals = ','.join(parts[24:])
-            row_data.append(signals)
-        else:
-            row_data = parts
+                # Pad short rows so every row has all 25 columns
+                if len(row_data) < 25:
+                    row_data += [''] * (25 - len(row_data))
 
-        # Create a dictionary with proper column names
-        row_dict = {expected_cols[i]: row_data[i] for i in range(len(row_data))}
-        fixed_rows.append(row_dict)
+                writer.writerow(row_data)
+                processed += 1
 
-    # Write properly formatted CSV with quoting
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=expected_cols, quoting=csv.QUOTE_MINIMAL)
-        writer.writeheader()
-        writer.writerows(fixed_rows)
+        # mkstemp creates the file 0600; give it the permissions a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
     print(f"Fixed CSV written to: {output_file}")
-    print(f"Processed {len(fixed_rows)} rows")
+    print(f"Processed {processed} rows")
     return True
 
 if __name__ == "__main__":
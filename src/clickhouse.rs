@@ -54,8 +54,11 @@ pub async fn write_price_file(univ: String, is_production: bool) -> Result<(), B
         univ
     );
 
+    // Get a client connection once, shared by the ticker and price queries
+    let client = get_ch_client(ChConnectionType::Ace).await?;
+
     // Get the list of tickers in the universe that are already pre-filtered for validity
-    let tickers = get_universe_tickers(&univ).await?;
+    let tickers = get_universe_tickers(&client, &univ).await?;
 
     // Process in chunks of 500 tickers (adjust based on your memory constraints)
     let chunk_size = 500; // Reduced chunk size to avoid server memory limit
@@ -64,9 +67,6 @@ pub async fn write_price_file(univ: String, is_production: bool) -> Result<(), B
         .map(|chunk| chunk.to_vec())
         .collect();
 
-    // Get a client connection once
-    let client = get_ch_client(ChConnectionType::Ace).await?;
-
     // Create the final CSV file and writer once
     let file = File::create(&filename)?;
     let mut wtr = WriterBuilder::new().has_headers(false).from_writer(file);
@@ -176,9 +176,7 @@ fn build_price_query(univ: &str, ticker_list: &str, is_production: bool) -> Stri
 }
 
 // Helper function to get the list of tickers in a universe
-async fn get_universe_tickers(univ: &str) -> Result<Vec<String>, Box<dyn StdError>> {
-    let client = get_ch_client(ChConnectionType::Ace).await?;
-
+async fn get_universe_tickers(client: &Client, univ: &str) -> Result<Vec<String>, Box<dyn StdError>> {
     let query = if univ == "Crypto" {
         "SELECT DISTINCT baseCurrency AS Ticker FROM tiingo.crypto".to_string()
     } else {
@@ -1,11 +1,12 @@
 use polars::datatypes::DataType;
 use polars::prelude::*;
+use rayon::prelude::*;
 use serde::Serialize;
 use std::{
     cmp, collections::HashSet, env, error::Error as StdError, fmt::Debug, fs::File, io::Cursor,
     path::Path, sync::Arc,
 };
-use tokio::{fs, task::JoinError};
+use tokio::fs;
 pub mod config;
 pub mod portfolio_accounting;
 mod signals {
@@ -712,8 +713,9 @@ pub async fn sig(
     param: f64,
     signal_name: String,
 ) -> Result<(Backtest, Backtest, Vec<Decision>), Box<dyn StdError>> {
-    let s = (func)(df.clone().collect()?, param); // Call the signal function
-    let (bt, bt_se, decisions) = backtest_performance(df.collect()?, s, &signal_name)?;
+    let df = df.collect()?;
+    let s = (func)(df.clone(), param); // Call the signal function
+    let (bt, bt_se, decisions) = backtest_performance(df, s, &signal_name)?;
     // println!("Backtest for signal '{}': {:?}", signal_name, decisions);
     Ok((bt, bt_se, decisions))
 }
@@ -726,42 +728,49 @@ pub async fn sig_sized(
     entry_amount: f64,
     exit_amount: f64,
 ) -> Result<(Backtest, Vec<Decision>), Box<dyn StdError>> {
-    let s = (func)(df.clone().collect()?, param); // Call the signal function
+    let df = df.collect()?;
+    let s = (func)(df.clone(), param); // Call the signal function
     let (bt, decisions) =
-        backtest_performance_sized(df.collect()?, s, &signal_name, entry_amount, exit_amount)?;
+        backtest_performance_sized(df, s, &signal_name, entry_amount, exit_amount)?;
     Ok((bt, decisions))
 }
 
 pub async fn run_all_backtests(
-    df: LazyFrame,
+    df: DataFrame,
     signals: Vec<Signal>,
-) -> Result<Vec<(Backtest, Vec<Decision>)>, JoinError> {
-    // Wrap df in an Arc for shared ownership across tasks
-    let df = Arc::new(df);
-
-    let futures: Vec<_> = signals
-        .into_iter()
-        .map(|signal| {
-            // Clone Arc for each task
-            let df_clone = Arc::clone(&df);
-            let func = signal.func.clone(); // Extract the function from the Signal struct
-            let _p = signal.param; // Use default value if no parameter is provided
-
-            tokio::spawn(async move {
-                // sig(df_clone.as_ref().clone(), *func, p).await.unwrap()
-                sig(df_clone.as_ref().clone(), *func, signal.param, signal.name)
-                    .await
-                    .unwrap()
+) -> Result<Vec<(Backtest, Vec<Decision>)>, Box<dyn StdError>> {
+    // The caller collects the ticker's frame once and every strategy shares it.
+    // Strategies are independent and CPU-bound, so run them on rayon's thread pool
+    // from a blocking task rather than one tokio task each; async workers stay free
+    // and parallelism is bounded by the core count
+    let results = tokio::task::spawn_blocking(move || {
+        signals
+            .into_par_iter()
+            .filter_map(|signal| {
+                // A failing or panicking strategy is reported and skipped, not fatal for the ticker
+                let result = std::panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
+                    let s = (*signal.func)(df.clone(), signal.param);
+                    backtest_performance(df.clone(), s, &signal.name)
+                }));
+                match result {
+                    Ok(Ok(backtest)) => Some(backtest),
+                    Ok(Err(e)) => {
+                        eprintln!("Error in strategy {}: {}", signal.name, e);
+                        None
+                    }
+                    Err(_) => {
+                        eprintln!("Strategy {} panicked, skipping", signal.name);
+                        None
+                    }
+                }
             })
-        })
-        .collect();
-
-    let results = futures::future::join_all(futures).await;
+            .collect::<Vec<_>>()
+    })
+    .await?;
 
     // Flatten both Backtest variants (buy-exit and sell-exit) into the same Vec
     let backtests: Vec<(Backtest, Vec<Decision>)> = results
         .into_iter()
-        .filter_map(Result::ok)
         .flat_map(|(bt, bt_se, decisions)| {
             vec![(bt, decisions.clone()), (bt_se, decisions)]
         })
@@ -854,8 +863,14 @@ fn compute_metrics(
         .min_by(|a, b| a.partial_cmp(b).unwrap_or(std::cmp::Ordering::Equal))
         .unwrap_or(0.0);
 
+    // Mean of the per-bar results, computed once and shared by Sharpe, Sortino and Calmar
+    let mean_return = if !total_result.is_empty() {
+        total_result.iter().sum::<f64>() / total_result.len() as f64
+    } else {
+        0.0
+    };
+
     let sharpe_ratio = if total_result.len() > 1 {
-        let mean_return = total_result.iter().sum::<f64>() / total_result.len() as f64;
         let std_dev = (total_result
             .iter()
             .map(|x| (x - mean_return).powi(2))
@@ -867,7 +882,6 @@ fn compute_metrics(
         0.0
     };
     let sortino_ratio = if total_result.len() > 1 {
-        let mean_return = total_result.iter().sum::<f64>() / total_result.len() as f64;
         let downside_deviation = (total_result
             .iter()
             .filter(|&&x| x < 0.0)
@@ -894,8 +908,7 @@ fn compute_metrics(
         max_dd
     };
     let calmar_ratio = if max_drawdown > 0.0 && !total_result.is_empty() {
-        let average_return = total_result.iter().sum::<f64>() / total_result.len() as f64;
-        average_return / max_drawdown
+        mean_return / max_drawdown
     } else {
         0.0
     };
@@ -936,74 +949,71 @@ pub fn backtest_performance(
     side: BuySell,
     strategy: &str,
 ) -> Result<(Backtest, Backtest, Vec<Decision>), Box<dyn StdError>> {
-    let df = df.clone();
     let len = df.height();
 
-    let mut long_result = vec![0.0; len];
-    let mut short_result = vec![0.0; len];
-    let mut long_result_se = vec![0.0; len];
-    let mut short_result_se = vec![0.0; len];
+    let mut total_result = vec![0.0; len];
+    let mut total_result_se = vec![0.0; len];
 
     let open = df.column("Open").unwrap().f64().unwrap();
 
-    // Approach 1: buy OR sell signal closes the position (variable holding period)
-    for i in 0..len {
-        if side.buy[i] == 1 {
-            for a in i + 1..cmp::min(i + 1000, len) {
-                if side.buy[a] == 1 || side.sell[a] == -1 {
-                    long_result[a] = open.get(a).unwrap_or(0.0) - open.get(i).unwrap_or(0.0);
-                    break;
-                }
-            }
+    // next_signal[i] is the first bar after i carrying a buy or sell (len if none),
+    // filled by one backward pass so each entry finds its exit in O(1)
+    let mut next_signal = vec![len; len];
+    let mut next = len;
+    for i in (0..len).rev() {
+        next_signal[i] = next;
+        if side.buy[i] == 1 || side.sell[i] == -1 {
+            next = i;
         }
     }
+
+    // Approach 1: buy OR sell signal closes the position (variable holding period).
+    // Long (buy) and short (sell) entries are resolved in the same pass and both
+    // accumulate straight into total_result at the exit bar.
     for i in 0..len {
-        if side.sell[i] == -1 {
-            for a in i + 1..cmp::min(i + 1000, len) {
-                if side.buy[a] == 1 || side.sell[a] == -1 {
-                    short_result[a] = open.get(i).unwrap_or(0.0) - open.get(a).unwrap_or(0.0);
-                    break;
-                }
+        let is_buy = side.buy[i] == 1;
+        let is_sell = side.sell[i] == -1;
+        if !is_buy && !is_sell {
+            continue;
+        }
+        let a = next_signal[i];
+        if a < cmp::min(i + 1000, len) {
+            let entry_price = open.get(i).unwrap_or(0.0);
+            let exit_price = open.get(a).unwrap_or(0.0);
+            if is_buy {
+                total_result[a] += exit_price - entry_price;
+            }
+            if is_sell {
+                total_result[a] += entry_price - exit_price;
             }
         }
     }
 
     // Approach 2 (_se = sell exit): only an opposing signal closes the position.
     // A subsequent buy while already long is ignored (you're already in).
+    // The long and short books are independent, so both are stepped in one pass.
     let mut in_long = false;
     let mut long_entry_price = 0.0;
+    let mut in_short = false;
+    let mut short_entry_price = 0.0;
     for i in 0..len {
+        let price = open.get(i).unwrap_or(0.0);
         if !in_long && side.buy[i] == 1 {
             in_long = true;
-            long_entry_price = open.get(i).unwrap_or(0.0);
+            long_entry_price = price;
         } else if in_long && side.sell[i] == -1 {
-            long_result_se[i] = open.get(i).unwrap_or(0.0) - long_entry_price;
+            total_result_se[i] += price - long_entry_price;
             in_long = false;
         }
-    }
-    let mut in_short = false;
-    let mut short_entry_price = 0.0;
-    for i in 0..len {
         if !in_short && side.sell[i] == -1 {
             in_short = true;
-            short_entry_price = open.get(i).unwrap_or(0.0);
+            short_entry_price = price;
         } else if in_short && side.buy[i] == 1 {
-            short_result_se[i] = short_entry_price - open.get(i).unwrap_or(0.0);
+            total_result_se[i] += short_entry_price - price;
             in_short = false;
         }
     }
 
-    let total_result: Vec<f64> = long_result
-        .iter()
-        .zip(short_result.iter())
-        .map(|(&l, &s)| l + s)
-        .collect();
-    let total_result_se: Vec<f64> = long_result_se
-        .iter()
-        .zip(short_result_se.iter())
-        .map(|(&l, &s)| l + s)
-        .collect();
-
     let buys = side.buy.iter().sum::<i32>();
     let sells = side.sell.iter().sum::<i32>().abs();
     let buy = side.buy.get(len - 1).cloned().unwrap_or(0);
@@ -1013,31 +1023,21 @@ pub fn backtest_performance(
     let ticker = ticker1.trim_matches('"').to_string();
     let universe1 = df.column("Universe").unwrap().get(0).unwrap_or("".into()).to_string();
     let universe = universe1.trim_matches('"').to_string();
-    let date1 = df.column("Date").unwrap().get(len - 1).unwrap_or("".into()).to_string();
+    let dates = df.column("Date").unwrap();
+    let date1 = dates.get(len - 1).unwrap_or("".into()).to_string();
     let date = date1.trim_matches('"').to_string();
 
+    // Look the Date column up once and only format dates for rows that carry a signal
     let mut decisions = Vec::new();
     for i in 0..len {
+        if side.buy[i] != 1 && side.sell[i] != -1 {
+            continue;
+        }
+        let date_str = dates.get(i).unwrap_or("".into()).to_string().trim_matches('"').to_string();
         if side.buy[i] == 1 {
-            let date_str = df
-                .column("Date")
-                .unwrap()
-                .get(i)
-                .unwrap_or("".into())
-                .to_string()
-                .trim_matches('"')
-                .to_string();
-            decisions.push(Decision { date: date_str, action: "buy".to_string() });
+            decisions.push(Decision { date: date_str.clone(), action: "buy".to_string() });
         }
         if side.sell[i] == -1 {
-            let date_str = df
-                .column("Date")
-                .unwrap()
-                .get(i)
-                .unwrap_or("".into())
-                .to_string()
-                .trim_matches('"')
-                .to_string();
             decisions.push(Decision { date: date_str, action: "sell".to_string() });
         }
     }
@@ -1063,7 +1063,6 @@ pub fn backtest_performance_sized(
     entry_amount: f64,
     exit_amount: f64,
 ) -> Result<(Backtest, Vec<Decision>), Box<dyn StdError>> {
-    let df = df.clone();
     let len = df.height();
 
     let mut cash = 100_000.0; // Starting cash
@@ -1186,40 +1185,33 @@ pub fn backtest_performance_sized(
         .to_string()
         .trim_matches('"')
         .to_string();
-    let date = df
-        .column("Date")
-        .unwrap()
+    let dates = df.column("Date").unwrap();
+    let date = dates
         .get(len - 1)
         .unwrap_or("".into())
         .to_string()
         .trim_matches('"')
         .to_string();
 
+    // Look the Date column up once and only format dates for rows that carry a signal
     let mut decisions = Vec::new();
     for i in 0..len {
+        if side.buy[i] != 1 && side.sell[i] != -1 {
+            continue;
+        }
+        let date_str = dates
+            .get(i)
+            .unwrap_or("".into())
+            .to_string()
+            .trim_matches('"')
+            .to_string();
         if side.buy[i] == 1 {
-            let date_str = df
-                .column("Date")
-                .unwrap()
-                .get(i)
-                .unwrap_or("".into())
-                .to_string()
-                .trim_matches('"')
-                .to_string();
             decisions.push(Decision {
-                date: date_str,
+                date: date_str.clone(),
                 action: "buy".to_string(),
             });
         }
         if side.sell[i] == -1 {
-            let date_str = df
-                .column("Date")
-                .unwrap()
-                .get(i)
-                .unwrap_or("".into())
-                .to_string()
-                .trim_matches('"')
-                .to_string();
             decisions.push(Decision {
                 date: date_str,
                 action: "sell".to_string(),
@@ -1228,8 +1220,13 @@ pub fn backtest_performance_sized(
     }
 
     // Additional Metrics
+    let mean_return = if percentage_returns.len() > 0 {
+        percentage_returns.iter().sum::<f64>() / percentage_returns.len() as f64
+    } else {
+        0.0
+    };
+
     let sharpe_ratio = if percentage_returns.len() > 1 {
-        let mean_return = percentage_returns.iter().sum::<f64>() / percentage_returns.len() as f64;
         let std_dev = (percentage_returns
             .iter()
             .map(|x| (x - mean_return).powi(2))
@@ -1247,7 +1244,6 @@ pub fn backtest_performance_sized(
     };
 
     let sortino_ratio = if percentage_returns.len() > 1 {
-        let mean_return = percentage_returns.iter().sum::<f64>() / percentage_returns.len() as f64;
         let downside_deviation = (percentage_returns
             .iter()
             .filter(|&&x| x < 0.0)
@@ -1768,6 +1764,31 @@ pub fn postprocess(df: DataFrame) -> Result<DataFrame, Box<dyn StdError>> {
     Ok(out)
 }
 
+/// Build the ticker,strategy,date,action decisions frame column by column, instead of
+/// a serde_json object per decision that is then serialized and parsed back
+fn decisions_dataframe<'a>(
+    rows: impl Iterator<Item = (&'a Backtest, &'a Decision)>,
+) -> PolarsResult<DataFrame> {
+    let mut tickers: Vec<&str> = Vec::new();
+    let mut strategies: Vec<&str> = Vec::new();
+    let mut dates: Vec<&str> = Vec::new();
+    let mut actions: Vec<&str> = Vec::new();
+
+    for (bt, d) in rows {
+        tickers.push(&bt.ticker);
+        strategies.push(&bt.strategy);
+        dates.push(&d.date);
+        actions.push(&d.action);
+    }
+
+    df! {
+        "ticker" => tickers,
+        "strategy" => strategies,
+        "date" => dates,
+        "action" => actions,
+    }
+}
+
 pub async fn save_backtest(
     paths: &crate::config::PathConfig,
     bt: Vec<(Backtest, Vec<Decision>)>,
@@ -1802,28 +1823,17 @@ pub async fn save_backtest(
             if is_production { config::ExecutionMode::Production } else { config::ExecutionMode::Testing });
 
         // Group decisions by strategy
-        let mut strategy_decisions: std::collections::HashMap<String, Vec<serde_json::Value>> = std::collections::HashMap::new();
+        let mut strategy_decisions: std::collections::HashMap<&str, Vec<(&Backtest, &Decision)>> = std::collections::HashMap::new();
 
         for (bt, decisions) in &bt {
-            let strategy_name = bt.strategy.clone();
-            let decision_list = strategy_decisions.entry(strategy_name).or_insert_with(Vec::new);
-
-            for d in decisions {
-                decision_list.push(serde_json::json!({
-                    "ticker": bt.ticker.clone(),
-                    "strategy": bt.strategy.clone(),
-                    "date": d.date.clone(),
-                    "action": d.action.clone(),
-                }));
-            }
+            let decision_list = strategy_decisions.entry(bt.strategy.as_str()).or_insert_with(Vec::new);
+            decision_list.extend(decisions.iter().map(|d| (bt, d)));
         }
 
         // Save each strategy's decisions to a separate file
         for (strategy, decisions) in strategy_decisions {
             if !decisions.is_empty() {
-                let json = serde_json::to_string(&decisions)?;
-                let cursor = Cursor::new(json);
-                let mut df_decisions = JsonReader::new(cursor).finish()?;
+                let mut df_decisions = decisions_dataframe(decisions.into_iter())?;
                 let decisions_path = format!("{}/{}_{}_decisions.csv", base_path, ticker, strategy);
                 let mut csvfile = File::create(decisions_path)?;
                 let _ = CsvWriter::new(&mut csvfile).finish(&mut df_decisions);
@@ -1831,22 +1841,11 @@ pub async fn save_backtest(
         }
     } else {
         // In production mode, save all decisions together in the decisions folder
-        let mut all_decisions = Vec::new();
-        for (bt, decisions) in &bt {
-            for d in decisions {
-                all_decisions.push(serde_json::json!({
-                    "ticker": bt.ticker.clone(),
-                    "strategy": bt.strategy.clone(),
-                    "date": d.date.clone(),
-                    "action": d.action.clone(),
-                }));
-            }
-        }
+        let mut df_decisions = decisions_dataframe(
+            bt.iter().flat_map(|(bt, decisions)| decisions.iter().map(move |d| (bt, d))),
+        )?;
 
-        if !all_decisions.is_empty() {
-            let json = serde_json::to_string(&all_decisions)?;
-            let cursor = Cursor::new(json);
-            let mut df_decisions = JsonReader::new(cursor).finish()?;
+        if df_decisions.height() > 0 {
             let decisions_path = paths.decision_file(univ, &ticker);
             tokio::fs::create_dir_all(format!("{}/decisions", paths.base)).await?;
             let mut csvfile = File::create(decisions_path)?;
@@ -57,7 +57,7 @@ mod tests;
 use backtester::config::{BacktestConfig, ExecutionMode, PathConfig};
 
 pub async fn select_backtests(
-    lf: LazyFrame,
+    df: DataFrame,
     tag: &str,
     strategy_filter: Option<&str>,
 ) -> Result<Vec<(Backtest, Vec<Decision>)>, Box<dyn StdError>> {
@@ -88,7 +88,7 @@ pub async fn select_backtests(
     }
 
     // Run all backtests
-    Ok(run_all_backtests(lf, signals).await?)
+    Ok(run_all_backtests(df, signals).await?)
 }
 
 /// Load price data and return LazyFrame with latest date
@@ -224,13 +224,21 @@ async fn backtest_helper(
                 async move {
                     let filtered_lf = lf_clone.filter(col("Ticker").eq(lit(ticker_clone.clone())));
 
-                    // Debug: check if filtering returned any rows
-                    if let Ok(filtered_df) = filtered_lf.clone().collect() {
-                        debug!("Ticker '{}' filtered dataframe has {} rows", ticker_clone, filtered_df.height());
-                        if filtered_df.height() == 0 {
-                            warn!("No data found for ticker '{}' after filtering - skipping", ticker_clone);
-                            return (ticker_clone, Ok(Vec::new()));
+                    // Collect the ticker's frame once; every strategy backtest shares it
+                    let filtered_df = match filtered_lf.collect() {
+                        Ok(df) => df,
+                        Err(e) => {
+                            let e: Box<dyn StdError> = Box::new(e);
+                            eprintln!("{}", display::format_execution_error(&ticker_clone, e.as_ref()));
+                            return (ticker_clone, Err(e));
                         }
+                    };
+
+                    // Debug: check if filtering returned any rows
+                    debug!("Ticker '{}' filtered dataframe has {} rows", ticker_clone, filtered_df.height());
+                    if filtered_df.height() == 0 {
+                        warn!("No data found for ticker '{}' after filtering - skipping", ticker_clone);
+                        return (ticker_clone, Ok(Vec::new()));
                     }
 
                     let tag: &str = match (mode, u_clone.as_str()) {
@@ -251,7 +259,7 @@ async fn backtest_helper(
                     // ./target/release/backtester -u LC -m testing -t IBM
                     // cargo run -- -u Crypto -m testing -t btc
 
-                    match select_backtests(filtered_lf, tag, strategy_filter).await {
+                    match select_backtests(filtered_df, tag, strategy_filter).await {
                         Ok(backtest_results) => {
                             if let Err(e) = save_backtest(
                                 &paths_clone,
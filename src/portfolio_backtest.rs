@@ -110,13 +110,21 @@ struct UnivRow {
     ticker: String,
 }
 
+/// Signal direction, parsed once when decision files are read
+/// Ordered Buy < Sell to match the previous lowercase string ordering
+#[derive(Debug, Clone, Copy, PartialEq, Eq, PartialOrd, Ord)]
+enum Action {
+    Buy,
+    Sell,
+}
+
 /// Represents a single trading signal from decision files
 #[derive(Debug, Clone)]
 struct Signal {
     ticker: String,
     strategy: String,
     date: NaiveDate,
-    action: String, // "buy" or "sell"
+    action: Action,
 }
 
 /// ClickHouse price data row
@@ -198,7 +206,7 @@ pub async fn get_ch_client(connection_type: ChConnectionType) -> Result<Client,
 pub async fn load_price_data_native(
     universe: &str,
     tickers: &[String],
-    connection_type: ChConnectionType,
+    client: &Client,
 ) -> Result<DataFrame, Box<dyn StdError>> {
 
     let ticker_list = tickers
@@ -230,9 +238,6 @@ pub async fn load_price_data_native(
     info!("Fetching prices for {} tickers from ClickHouse", tickers.len());
     debug!("ClickHouse query: {}", query);
 
-    // Get a client connection
-    let client = get_ch_client(connection_type).await?;
-
     // Collect all data
     let mut all_data: Vec<DTC> = Vec::new();
     let mut cursor = client.query(&query).fetch::<DTC>()?;
@@ -267,7 +272,7 @@ pub async fn load_price_data_native(
 async fn load_universe_tickers(
     universe: &str,
     sector: Option<&str>,
-    connection_type: ChConnectionType,
+    client: &Client,
 ) -> Result<Option<Vec<String>>, Box<dyn StdError>> {
     // Skip filtering for crypto or if no specific universe/sector requested
     if universe.to_uppercase() == "CRYPTO" {
@@ -316,7 +321,6 @@ async fn load_universe_tickers(
     );
 
     info!("Loading universe tickers: {}", query);
-    let client = get_ch_client(connection_type).await?;
 
     let mut tickers = Vec::new();
     let mut cursor = client.query(&query).fetch::<UnivRow>()?;
@@ -411,6 +415,15 @@ fn read_decision_files(
                     dates_col.get(i),
                     actions_col.get(i),
                 ) {
+                    // Only buy/sell rows affect the backtest
+                    let action = if action_str.eq_ignore_ascii_case("buy") {
+                        Action::Buy
+                    } else if action_str.eq_ignore_ascii_case("sell") {
+                        Action::Sell
+                    } else {
+                        continue;
+                    };
+
                     let ticker = ticker_str.to_uppercase();
 
                     // Apply ticker filter if provided
@@ -425,7 +438,7 @@ fn read_decision_files(
                             ticker,
                             strategy: strategy_str.to_string(),
                             date,
-                            action: action_str.to_lowercase(),
+                            action,
                         });
                     }
                 }
@@ -459,83 +472,66 @@ fn read_decision_files(
     Ok((signals, available_signals))
 }
 
-/// Get price for a specific ticker on a specific date
-/// If multiple prices exist for the same ticker+date, takes the MAX (deterministic)
-fn get_price(
-    prices_df: &DataFrame,
-    ticker: &str,
-    date: NaiveDate,
-) -> Result<Option<f64>, Box<dyn StdError>> {
-    let date_str = date.format("%Y-%m-%d").to_string();
-
-    let filtered = prices_df
-        .clone()
-        .lazy()
-        .filter(
-            col("Ticker").eq(lit(ticker))
-            .and(col("Date").eq(lit(date_str.clone())))
-        )
-        .collect()?;
-
-    if filtered.height() == 0 {
-        return Ok(None);
-    }
-
-    // Warn if there are duplicate prices (data quality issue)
-    if filtered.height() > 1 {
-        warn!("Multiple prices ({}) found for {} on {}", filtered.height(), ticker, date_str);
+/// Close prices keyed by date, then by upper-cased ticker
+type PriceIndex = BTreeMap<NaiveDate, HashMap<String, f64>>;
+
+/// Build the date -> ticker -> close index once so per-date lookups are O(log N)
+/// instead of a filter + group_by over the whole price frame for every trading day.
+/// Uses max() to handle duplicate ticker+date entries deterministically
+fn build_price_index(prices_df: &DataFrame) -> Result<PriceIndex, Box<dyn StdError>> {
+    let dates = prices_df.column("Date")?.str()?;
+    let tickers = prices_df.column("Ticker")?.str()?;
+    let closes = prices_df.column("Close")?.f64()?;
+
+    let mut index: PriceIndex = BTreeMap::new();
+    for i in 0..prices_df.height() {
+        if let (Some(date_str), Some(ticker), Some(close)) = (dates.get(i), tickers.get(i), closes.get(i)) {
+            if let Ok(date) = NaiveDate::parse_from_str(date_str, "%Y-%m-%d") {
+                index
+                    .entry(date)
+                    .or_insert_with(HashMap::new)
+                    .entry(ticker.to_uppercase())
+                    .and_modify(|price| {
+                        // Warn if there are duplicate prices (data quality issue)
+                        warn!("Multiple prices found for {} on {}", ticker, date);
+                        *price = price.max(close);
+                    })
+                    .or_insert(close);
+            }
+        }
     }
 
-    // Use max() for deterministic result when duplicates exist
-    let close = filtered.column("Close")?
-        .f64()?
-        .max();
-
-    Ok(close)
+    debug!("Indexed prices for {} dates", index.len());
+    Ok(index)
 }
 
 /// Get prices for all tickers on a specific date
-/// Uses max() aggregation to handle duplicate ticker+date entries deterministically
 fn get_prices_for_date(
-    prices_df: &DataFrame,
+    price_index: &PriceIndex,
     date: NaiveDate,
-) -> Result<HashMap<String, f64>, Box<dyn StdError>> {
-    use polars::prelude::*;
-
-    let date_str = date.format("%Y-%m-%d").to_string();
-
-    // Filter by date and group by ticker, taking max price for determinism
-    let aggregated = prices_df
-        .clone()
-        .lazy()
-        .filter(col("Date").eq(lit(date_str)))
-        .group_by([col("Ticker")])
-        .agg([col("Close").max().alias("Close")])
-        .collect()?;
-
-    let mut prices = HashMap::new();
-
-    if aggregated.height() == 0 {
-        return Ok(prices);
-    }
-
-    let tickers = aggregated.column("Ticker")?.str()?;
-    let closes = aggregated.column("Close")?.f64()?;
-
-    for i in 0..aggregated.height() {
-        if let (Some(ticker), Some(price)) = (tickers.get(i), closes.get(i)) {
-            prices.insert(ticker.to_uppercase(), price);
-        }
-    }
+) -> Option<&HashMap<String, f64>> {
+    price_index.get(&date)
+}
 
-    Ok(prices)
+/// Get price for a specific ticker on a specific date
+fn get_price(
+    price_index: &PriceIndex,
+    ticker: &str,
+    date: NaiveDate,
+) -> Option<f64> {
+    price_index
+        .get(&date)
+        .and_then(|prices| prices.get(ticker))
+        .copied()
 }
 
-/// Rank buy candidates by priority strategy signal count
+/// Rank buy candidates by priority strategy signal count, keeping only the top `limit`
+/// Also returns the total number of candidates before truncation
 fn rank_buy_candidates(
     buy_signals: &[Signal],
     priority_strategy: &str,
-) -> Vec<(String, usize)> {
+    limit: usize,
+) -> (Vec<(String, usize)>, usize) {
     let mut ticker_scores: HashMap<String, usize> = HashMap::new();
 
     // Count priority strategy signals
@@ -545,17 +541,27 @@ fn rank_buy_candidates(
         }
     }
 
-    // Convert to sorted vector (descending by score, then alphabetically by ticker for determinism)
-    let mut ranked: Vec<(String, usize)> = ticker_scores.into_iter().collect();
-    ranked.sort_by(|a, b| {
+    // Descending by score, then alphabetically by ticker for determinism
+    let by_rank = |a: &(String, usize), b: &(String, usize)| {
         match b.1.cmp(&a.1) {
             std::cmp::Ordering::Equal => a.0.cmp(&b.0),  // Alphabetical for ties
             other => other,
         }
-    });
+    };
 
-    debug!("Ranked {} buy candidates", ranked.len());
-    ranked
+    let mut ranked: Vec<(String, usize)> = ticker_scores.into_iter().collect();
+    let candidate_count = ranked.len();
+    debug!("Ranked {} buy candidates", candidate_count);
+
+    // Only the open slots get filled, so partition the top `limit` to the front
+    // and sort just that prefix instead of the whole candidate list
+    if limit < ranked.len() {
+        ranked.select_nth_unstable_by(limit, by_rank);
+        ranked.truncate(limit);
+    }
+    ranked.sort_by(by_rank);
+
+    (ranked, candidate_count)
 }
 
 /// Run the portfolio backtest
@@ -570,6 +576,9 @@ async fn backtest_portfolio(
     let mut portfolio = PortfolioAccounting::new(initial_cash);
     let commission = args.commission;
 
+    // Index prices by date once up front
+    let price_index = build_price_index(&prices_df)?;
+
     // Track last rebalance date if rebalancing is enabled
     let mut last_rebalance_date: Option<NaiveDate> = None;
 
@@ -601,14 +610,13 @@ async fn backtest_portfolio(
         signals_by_date.entry(signal.date).or_insert_with(Vec::new).push(signal);
     }
 
-    // Sort signals within each day for deterministic ordering (by ticker, then strategy, then action)
-    for signals in signals_by_date.values_mut() {
-        signals.sort_by(|a, b| {
-            a.ticker.cmp(&b.ticker)
-                .then_with(|| a.strategy.cmp(&b.strategy))
-                .then_with(|| a.action.cmp(&b.action))
-        });
-    }
+    // read_decision_files already sorts by (date, ticker, strategy, action) and grouping
+    // preserves that order, so each day's signals are in deterministic order without a re-sort
+    debug_assert!(signals_by_date.values().all(|signals| {
+        signals.windows(2).all(|w| {
+            (&w[0].ticker, &w[0].strategy, w[0].action) <= (&w[1].ticker, &w[1].strategy, w[1].action)
+        })
+    }));
 
     info!("Processing {} trading dates", signals_by_date.len());
 
@@ -618,12 +626,13 @@ async fn backtest_portfolio(
         debug!("Processing date: {}", date);
 
         // Get prices for today
-        let prices = get_prices_for_date(&prices_df, date)?;
-
-        if prices.is_empty() {
-            debug!("No price data for {}, skipping", date);
-            continue;
-        }
+        let prices = match get_prices_for_date(&price_index, date) {
+            Some(prices) if !prices.is_empty() => prices,
+            _ => {
+                debug!("No price data for {}, skipping", date);
+                continue;
+            }
+        };
 
         // 1. Check stop-losses on existing positions
         let mut positions_to_close = Vec::new();
@@ -659,14 +668,14 @@ async fn backtest_portfolio(
 
         // 2. Process sell signals (day after signal, so check if we have positions)
         let sell_signals: Vec<&Signal> = day_signals.iter()
-            .filter(|s| s.action == "sell")
+            .filter(|s| s.action == Action::Sell)
             .collect();
 
         for sell_signal in sell_signals {
             if portfolio.has_position(&sell_signal.ticker) {
                 // Close position on day after sell signal
                 let next_date = date + chrono::Duration::days(1);
-                if let Ok(Some(exit_price)) = get_price(&prices_df, &sell_signal.ticker, next_date) {
+                if let Some(exit_price) = get_price(&price_index, &sell_signal.ticker, next_date) {
                     if let Ok(_) = portfolio.execute_sell(next_date, &sell_signal.ticker, exit_price, commission) {
                         info!("SELL-SIGNAL {} on {}: @ ${:.2}", sell_signal.ticker, next_date, exit_price);
                     }
@@ -692,11 +701,11 @@ async fn backtest_portfolio(
                 if let Some(past_signals) = signals_by_date.get(&check_date) {
                     multi_day_buy_signals.extend(
                         past_signals.iter()
-                            .filter(|s| s.action == "buy" && !portfolio.has_position(&s.ticker))
+                            .filter(|s| s.action == Action::Buy && !portfolio.has_position(&s.ticker))
                             .cloned()
                     );
                     // Track tickers that also have sell signals in the window
-                    for s in past_signals.iter().filter(|s| s.action == "sell") {
+                    for s in past_signals.iter().filter(|s| s.action == Action::Sell) {
                         tickers_with_sell_signals.insert(s.ticker.clone());
                     }
                 }
@@ -739,12 +748,13 @@ async fn backtest_portfolio(
 
             if !buy_signals.is_empty() {
                 // Rank candidates by priority strategy
-                let ranked = rank_buy_candidates(&buy_signals, &args.priority_strategy);
+                let (ranked, candidate_count) =
+                    rank_buy_candidates(&buy_signals, &args.priority_strategy, available_slots);
 
-                // Log ranking for determinism debugging
+                // Log ranking for determinism debugging (full candidate count, not just the kept slots)
                 if !ranked.is_empty() {
                     debug!("Date {}: ranked {} candidates, top 3: {:?}",
-                           date, ranked.len(), ranked.iter().take(3).collect::<Vec<_>>());
+                           date, candidate_count, ranked.iter().take(3).collect::<Vec<_>>());
                 }
 
                 // Fill available slots with top-ranked candidates
@@ -756,7 +766,7 @@ async fn backtest_portfolio(
                     // Entry on day after buy signal
                     let next_date = date + chrono::Duration::days(1);
 
-                    if let Ok(Some(entry_price)) = get_price(&prices_df, ticker, next_date) {
+                    if let Some(entry_price) = get_price(&price_index, ticker, next_date) {
                         // Calculate position size: equal weight allocation
                         let target_positions = args.portfolio_size as f64;
                         let position_value = portfolio.get_total_value() / target_positions;
@@ -775,7 +785,7 @@ async fn backtest_portfolio(
         }
 
         // 4. Mark-to-market all positions and take daily snapshot
-        portfolio.mark_to_market(date, &prices);
+        portfolio.mark_to_market(date, prices);
         portfolio.take_daily_snapshot(date);
 
         // 5. Check and perform rebalancing if needed
@@ -857,11 +867,11 @@ async fn backtest_portfolio(
             .map(|s| s.date)
             .unwrap_or_else(|| chrono::Utc::now().date_naive());
 
-        let final_prices = get_prices_for_date(&prices_df, final_date)?;
+        let final_prices = get_prices_for_date(&price_index, final_date);
         let commission = 0.0;
 
         for ticker in position_tickers {
-            if let Some(&exit_price) = final_prices.get(&ticker) {
+            if let Some(&exit_price) = final_prices.and_then(|p| p.get(&ticker)) {
                 if let Ok(_) = portfolio.execute_sell(final_date, &ticker, exit_price, commission) {
                     debug!("Closed final position {} at {}", ticker, exit_price);
                 }
@@ -951,12 +961,15 @@ async fn main() -> Result<(), Box<dyn StdError>> {
         }
     };
 
+    // One client for the whole run so the universe and price queries share its
+    // connection pool instead of each building a client and re-checking the server
+    let client = get_ch_client(connection_type).await?;
 
     // Load universe/sector filter from ClickHouse
     let universe_tickers = load_universe_tickers(
         &args.universe,
         args.sector.as_deref(),
-        connection_type,
+        &client,
     ).await?;
 
     // Merge universe filter with explicit --tickers filter
@@ -1027,7 +1040,7 @@ async fn main() -> Result<(), Box<dyn StdError>> {
     let prices_df = load_price_data_native(
         &args.universe,
         &unique_tickers,
-        connection_type,
+        &client,
     )
     .await?;
 
@@ -490,6 +490,106 @@ mod backtest_result_tests {
         assert_eq!(buysell.sell[0], 1);
         println!("✓ BuySell struct creation works correctly");
     }
+
+    #[test]
+    fn test_backtest_performance_exits() {
+        // Open: 100, 105, 103, 108, 110
+        let df = create_test_price_data();
+        let side = BuySell {
+            buy: vec![1, 0, 0, 0, 0],
+            sell: vec![0, 0, -1, 0, 0],
+        };
+
+        let (bt, bt_se, decisions) = backtest_performance(df, side, "test").unwrap();
+
+        // Long from bar 0 is closed by the sell on bar 2; the short opened there never exits
+        assert_eq!(bt.trades, 1);
+        assert_eq!(bt.max_gain, 3.0);
+        assert_eq!(bt_se.strategy, "test_se");
+        assert_eq!(bt_se.trades, 1);
+        assert_eq!(bt_se.max_gain, 3.0);
+        assert_eq!(decisions.len(), 2);
+        assert_eq!(decisions[1].action, "sell");
+        println!("✓ Backtest performance exits work correctly");
+    }
+
+    /// Price frame of `len` bars with Open rising by 1.0 per bar from 100.0
+    fn create_rising_price_data(len: usize) -> DataFrame {
+        let dates: Vec<String> = (0..len).map(|i| format!("bar-{}", i)).collect();
+        let opens: Vec<f64> = (0..len).map(|i| 100.0 + i as f64).collect();
+        df! {
+            "Date" => dates,
+            "Ticker" => vec!["btc"; len],
+            "Universe" => vec!["Crypto"; len],
+            "Open" => opens,
+        }.unwrap()
+    }
+
+    #[test]
+    fn test_backtest_performance_exit_horizon() {
+        let len = 1002;
+
+        // Exit 999 bars after entry is inside the 1000-bar horizon
+        let mut buy = vec![0; len];
+        let mut sell = vec![0; len];
+        buy[0] = 1;
+        sell[999] = -1;
+        let (bt, _, _) =
+            backtest_performance(create_rising_price_data(len), BuySell { buy, sell }, "test").unwrap();
+        assert_eq!(bt.trades, 1);
+        assert_eq!(bt.max_gain, 999.0);
+
+        // Exit exactly 1000 bars after entry is beyond the horizon and produces no result
+        let mut buy = vec![0; len];
+        let mut sell = vec![0; len];
+        buy[0] = 1;
+        sell[1000] = -1;
+        let (bt, _, _) =
+            backtest_performance(create_rising_price_data(len), BuySell { buy, sell }, "test").unwrap();
+        assert_eq!(bt.trades, 0);
+        assert_eq!(bt.max_gain, 0.0);
+        println!("✓ Backtest performance exit horizon works correctly");
+    }
+
+    #[test]
+    fn test_backtest_performance_buy_and_sell_same_bar() {
+        // Open: 100, 105, 103, 108, 110
+        let df = create_test_price_data();
+        let side = BuySell {
+            buy: vec![1, 0, 0, 0, 0],
+            sell: vec![-1, 0, -1, 0, 0],
+        };
+
+        let (bt, _, _) = backtest_performance(df, side, "test").unwrap();
+
+        // Long (+3) and short (-3) from bar 0 both exit on bar 2 and cancel to 0
+        assert_eq!(bt.trades, 0);
+        assert_eq!(bt.max_gain, 0.0);
+        assert_eq!(bt.max_loss, 0.0);
+        println!("✓ Backtest performance same-bar buy and sell cancel correctly");
+    }
+
+    #[test]
+    fn test_backtest_performance_chained_entries() {
+        // Open: 100, 105, 103, 108, 110
+        let df = create_test_price_data();
+        let side = BuySell {
+            buy: vec![1, 1, 0, 0, 0],
+            sell: vec![0, 0, 0, -1, 0],
+        };
+
+        let (bt, bt_se, _) = backtest_performance(df, side, "test").unwrap();
+
+        // First long exits at the second entry (+5); second long exits on the sell (+3)
+        assert_eq!(bt.trades, 2);
+        assert_eq!(bt.max_gain, 5.0);
+        assert_eq!(bt.avg_gain, 4.0);
+
+        // Sell-exit ignores the second buy while long: one trade from 100 to 108
+        assert_eq!(bt_se.trades, 1);
+        assert_eq!(bt_se.max_gain, 8.0);
+        println!("✓ Backtest performance chained entries work correctly");
+    }
 }
 
 // ============================================================================